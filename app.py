@@ -1,8 +1,7 @@
 # app.py
 
 import streamlit as st
-import pandas as pd
-from predictor import prever_obesidade
+from predictor import prever_obesidade, carregar_pacote_modelo
 
 # -------------------------------
 # Configuração da página
@@ -13,6 +12,17 @@ st.caption("Informe seus dados, descubra seu IMC e seu estilo de vida.")
 
 st.markdown("---")
 
+# Modelo carregado uma única vez por processo
+@st.cache_resource
+def get_model_bundle():
+    return carregar_pacote_modelo()
+
+# Resultado memorizado para envios repetidos com os mesmos dados
+@st.cache_data(show_spinner=False)
+def _predict_cached(payload: tuple) -> dict:
+    model, feature_names = get_model_bundle()
+    return prever_obesidade(dict(payload), model, feature_names)
+
 # Função para classificar IMC
 def classificar_imc(imc: float) -> str:
     if imc < 18.5:
@@ -35,47 +45,51 @@ def classificar_imc(imc: float) -> str:
 # -------------------------------
 st.subheader("📋 Preencha seus dados")
 
-# Organizar campos em 3 colunas para reduzir rolagem
-col1, col2, col3 = st.columns(3)
-
-dados_usuario = {}
-
-# Coluna 1 - Dados básicos
-with col1:
-    dados_usuario["Idade"] = st.number_input("Idade (anos)", min_value=1, max_value=120, value=30, step=1)
-    dados_usuario["Altura"] = st.number_input("Altura (m)", min_value=0.5, max_value=2.5, value=1.70, step=0.01)
-    dados_usuario["Peso"] = st.number_input("Peso (kg)", min_value=1.0, max_value=300.0, value=70.0, step=0.1)
-    dados_usuario["Gênero"] = st.radio("Gênero", ["Feminino", "Masculino"])
-
-# Coluna 2 - Hábitos alimentares
-with col2:
-    dados_usuario["Consumo de Vegetais em Refeições Principais"] = st.slider("Porções de vegetais/dia", 0.0, 10.0, 3.0, 0.5)
-    dados_usuario["Número de Refeições Principais"] = st.slider("Refeições principais/dia", 1, 6, 3)
-    dados_usuario["Consumo de Água Diário"] = st.slider("Consumo de água (litros/dia)", 0.0, 5.0, 2.0, 0.1)
-    dados_usuario["Consumo de Alimento Altamente Calórico"] = st.selectbox("Alimentos calóricos?", ["Sim", "Não"])
-    dados_usuario["Consumo de Alimento Entre Refeições"] = st.selectbox("Lanches entre refeições", ["Às vezes", "Frequente", "Sempre", "Não"])
-
-# Coluna 3 - Estilo de vida
-with col3:
-    dados_usuario["Frequência de Atividade Física"] = st.slider("Atividade física (dias/semana)", 0, 7, 3)
-    dados_usuario["Tempo de Uso de Dispositivos Tecnológicos"] = st.slider("Uso de dispositivos (horas/dia)", 0.0, 24.0, 4.0, 0.5)
-    dados_usuario["Histórico Familiar"] = st.selectbox("Histórico Familiar de Obesidade", ["Sim", "Não"])
-    dados_usuario["Fumante"] = st.selectbox("Fumante", ["Sim", "Não"])
-    dados_usuario["Monitoramento de Consumo de Calorias"] = st.selectbox("Monitora calorias?", ["Sim", "Não"])
-    dados_usuario["Consumo de Álcool"] = st.selectbox("Consumo de álcool", ["Não", "Às vezes", "Frequente", "Sempre"])
-    dados_usuario["Meio de Transporte Utilizado"] = st.selectbox("Meio de transporte", ["Carro", "Bicicleta", "A pé", "Transporte público", "Moto"])
+# Campos agrupados em um formulário: o script só roda de novo ao enviar
+with st.form("previsao_form"):
+    # Organizar campos em 3 colunas para reduzir rolagem
+    col1, col2, col3 = st.columns(3)
+
+    dados_usuario = {}
+
+    # Coluna 1 - Dados básicos
+    with col1:
+        dados_usuario["Idade"] = st.number_input("Idade (anos)", min_value=1, max_value=120, value=30, step=1)
+        dados_usuario["Altura"] = st.number_input("Altura (m)", min_value=0.5, max_value=2.5, value=1.70, step=0.01)
+        dados_usuario["Peso"] = st.number_input("Peso (kg)", min_value=1.0, max_value=300.0, value=70.0, step=0.1)
+        dados_usuario["Gênero"] = st.radio("Gênero", ["Feminino", "Masculino"])
+
+    # Coluna 2 - Hábitos alimentares
+    with col2:
+        dados_usuario["Consumo de Vegetais em Refeições Principais"] = st.slider("Porções de vegetais/dia", 0.0, 10.0, 3.0, 0.5)
+        dados_usuario["Número de Refeições Principais"] = st.slider("Refeições principais/dia", 1, 6, 3)
+        dados_usuario["Consumo de Água Diário"] = st.slider("Consumo de água (litros/dia)", 0.0, 5.0, 2.0, 0.1)
+        dados_usuario["Consumo de Alimento Altamente Calórico"] = st.selectbox("Alimentos calóricos?", ["Sim", "Não"])
+        dados_usuario["Consumo de Alimento Entre Refeições"] = st.selectbox("Lanches entre refeições", ["Às vezes", "Frequente", "Sempre", "Não"])
+
+    # Coluna 3 - Estilo de vida
+    with col3:
+        dados_usuario["Frequência de Atividade Física"] = st.slider("Atividade física (dias/semana)", 0, 7, 3)
+        dados_usuario["Tempo de Uso de Dispositivos Tecnológicos"] = st.slider("Uso de dispositivos (horas/dia)", 0.0, 24.0, 4.0, 0.5)
+        dados_usuario["Histórico Familiar"] = st.selectbox("Histórico Familiar de Obesidade", ["Sim", "Não"])
+        dados_usuario["Fumante"] = st.selectbox("Fumante", ["Sim", "Não"])
+        dados_usuario["Monitoramento de Consumo de Calorias"] = st.selectbox("Monitora calorias?", ["Sim", "Não"])
+        dados_usuario["Consumo de Álcool"] = st.selectbox("Consumo de álcool", ["Não", "Às vezes", "Frequente", "Sempre"])
+        dados_usuario["Meio de Transporte Utilizado"] = st.selectbox("Meio de transporte", ["Carro", "Bicicleta", "A pé", "Transporte público", "Moto"])
+
+    submitted = st.form_submit_button("Calcular Previsão")
 
 st.markdown("---")
 
 # -------------------------------
-# Botão de previsão
+# Resultado da previsão
 # -------------------------------
 st.subheader("🔮 Resultado da Previsão")
 
-if st.button("Calcular Previsão"):
+if submitted:
     try:
-        df_usuario = pd.DataFrame([dados_usuario])
-        resultado = prever_obesidade(df_usuario)
+        payload = tuple(sorted(dados_usuario.items()))
+        resultado = _predict_cached(payload)
 
         # Sucesso
         st.success("✅ Previsão realizada com sucesso!")
@@ -1,9 +1,14 @@
 # predictor.py
 
-import joblib
-import pandas as pd
-import unicodedata
-from typing import Union, List
+from __future__ import annotations
+
+import numpy as np
+from functools import lru_cache
+from typing import TYPE_CHECKING, Union, List
+
+# pandas e joblib são importados sob demanda (partida mais rápida do app)
+if TYPE_CHECKING:
+    import pandas as pd
 
 # -------------------------------
 # Caminho do modelo
@@ -48,49 +53,76 @@ SCHEMA_NUMERICAS = [
     "IMC",
 ]
 
+# -------------------------------
+# Respostas afirmativas (já normalizadas)
+# -------------------------------
+_VALORES_SIM = frozenset({"sim", "yes", "true", "1", "y"})
+
 # -------------------------------
 # Utilitários
 # -------------------------------
 def carregar_modelo():
+    import joblib
+
     return joblib.load(MODEL_PATH)
 
+def carregar_pacote_modelo():
+    # Modelo + ordem das features, resolvida uma única vez no carregamento
+    model = carregar_modelo()
+    feature_names = getattr(model, "feature_names_in_", None)
+    return model, (tuple(feature_names) if feature_names is not None else None)
+
+_TABELA_ACENTOS = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇ",
+    "aaaaaeeeeiiiiooooouuuucAAAAAEEEEIIIIOOOOOUUUUC",
+)
+
 def _strip_accents(s: str) -> str:
-    return "".join(
-        c for c in unicodedata.normalize("NFD", str(s))
-        if unicodedata.category(c) != "Mn"
-    )
+    return str(s).translate(_TABELA_ACENTOS)
 
+@lru_cache(maxsize=4096, typed=True)
 def _norm(s: str) -> str:
-    return _strip_accents(s).strip().lower()
+    return _strip_accents(str(s)).strip().lower()
 
 # -------------------------------
 # Cálculos auxiliares
 # -------------------------------
 def calcular_imc(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
     if "IMC" not in df.columns:
-        df["IMC"] = df.apply(
-            lambda r: float(r["Peso"]) / (float(r["Altura"]) ** 2)
-            if r.get("Peso") and r.get("Altura")
-            else 0.0,
-            axis=1,
-        )
+        peso = df["Peso"].to_numpy(dtype=float)
+        altura = df["Altura"].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["IMC"] = np.where(
+                (peso != 0) & (altura != 0),
+                peso / np.square(altura),
+                0.0,
+            )
     return df
 
-def calcular_estilo(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
-    def avaliar(row):
-        atividade = float(row.get("Frequência de Atividade Física", 0)) >= 3
-        vegetais = float(row.get("Consumo de Vegetais em Refeições Principais", 0)) >= 3
-        agua = float(row.get("Consumo de Água Diário", 0)) >= 2
-        calorico = _norm(row.get("Consumo de Alimento Altamente Calórico", ""))
-        pouco_calorico = calorico not in ["sim", "yes", "true", "1", "y"]
-
-        return "Saudável" if (atividade and vegetais and agua and pouco_calorico) else "Não Saudável"
+# Mínimos de atividade física, vegetais e água para um estilo saudável
+LIMIARES_ESTILO = {
+    "Frequência de Atividade Física": 3,
+    "Consumo de Vegetais em Refeições Principais": 3,
+    "Consumo de Água Diário": 2,
+}
 
+def calcular_estilo(df: pd.DataFrame) -> pd.DataFrame:
     if "Estilo de vida saudável" not in df.columns:
-        df["Estilo de vida saudável"] = df.apply(avaliar, axis=1)
+        habitos = df.reindex(columns=list(LIMIARES_ESTILO), fill_value=0).to_numpy(dtype=float)
+        habitos_ok = (habitos >= np.fromiter(LIMIARES_ESTILO.values(), dtype=float)).all(axis=1)
+
+        if "Consumo de Alimento Altamente Calórico" in df.columns:
+            calorico = (
+                df["Consumo de Alimento Altamente Calórico"].astype(str)
+                .str.translate(_TABELA_ACENTOS).str.strip().str.lower()
+            )
+            pouco_calorico = ~calorico.isin(_VALORES_SIM).to_numpy()
+        else:
+            pouco_calorico = np.ones(len(df), dtype=bool)
+
+        df["Estilo de vida saudável"] = np.where(
+            habitos_ok & pouco_calorico, "Saudável", "Não Saudável"
+        )
 
     return df
 
@@ -106,7 +138,7 @@ def _pt_to_en_value(col: str, val: str) -> str:
         "Monitoramento de Consumo de Calorias",
         "Consumo de Alimento Altamente Calórico",
     ]:
-        return "Yes" if v in ["sim", "yes", "true", "1", "y"] else "No"
+        return "Yes" if v in _VALORES_SIM else "No"
 
     if col == "Consumo de Alimento Entre Refeições":
         if v in ["sempre", "always"]:
@@ -144,50 +176,196 @@ def _pt_to_en_value(col: str, val: str) -> str:
 
     return val
 
+# Valores oferecidos pelo formulário (além das próprias categorias do modelo)
+_VOCABULARIO_PT = {
+    "Gênero": ["Feminino", "Masculino"],
+    "Histórico Familiar": ["Sim", "Não"],
+    "Consumo de Alimento Altamente Calórico": ["Sim", "Não"],
+    "Consumo de Alimento Entre Refeições": ["Não", "Às vezes", "Frequente", "Sempre"],
+    "Fumante": ["Sim", "Não"],
+    "Monitoramento de Consumo de Calorias": ["Sim", "Não"],
+    "Consumo de Álcool": ["Não", "Às vezes", "Frequente", "Sempre"],
+    "Meio de Transporte Utilizado": [
+        "Carro", "Bicicleta", "A pé", "Transporte público", "Moto"
+    ],
+}
+
+# Tradução PT -> EN pré-computada por coluna, indexada pelo valor normalizado;
+# as próprias categorias do modelo (em qualquer grafia) mapeiam para si mesmas
+MAPA_CATEGORIAS = {
+    col: {
+        **{_norm(v): _pt_to_en_value(col, v) for v in _VOCABULARIO_PT.get(col, [])},
+        **{_norm(c): c for c in cats},
+    }
+    for col, cats in SCHEMA_CATEGORIAS.items()
+}
+
+# Categorias que a tradução mantém inalteradas (podem seguir direto para o modelo)
+_CATEGORIAS_DIRETAS = {
+    col: frozenset(c for c in cats if MAPA_CATEGORIAS[col][_norm(c)] == c)
+    for col, cats in SCHEMA_CATEGORIAS.items()
+}
+
+@lru_cache(maxsize=None)
+def _tipos_categoricos() -> dict:
+    # Criados uma única vez, no primeiro uso (pandas é importado sob demanda)
+    import pandas as pd
+
+    return {
+        col: pd.CategoricalDtype(cats, ordered=False)
+        for col, cats in SCHEMA_CATEGORIAS.items()
+    }
+
 def _normalizar_categoricos(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    tipos = _tipos_categoricos()
     for col, cats in SCHEMA_CATEGORIAS.items():
         if col in df.columns:
-            df[col] = df[col].apply(lambda x: _pt_to_en_value(col, x))
-            df[col] = pd.Categorical(df[col], categories=cats)
+            valores = df[col]
+            validos = valores.isin(_CATEGORIAS_DIRETAS[col])
+            if validos.all():
+                df[col] = valores.astype(tipos[col])
+                continue
+
+            # Traduz apenas as linhas que ainda não estão no formato do modelo
+            pendentes = valores[~validos]
+            traducao = pendentes.astype(str).map(_norm).map(MAPA_CATEGORIAS[col])
+            faltantes = traducao.isna()
+            if faltantes.any():
+                traducao = traducao.fillna(
+                    pendentes[faltantes].map(lambda x: _pt_to_en_value(col, x))
+                )
+            traduzidos = valores.astype(object)
+            traduzidos[~validos] = traducao
+            df[col] = traduzidos.astype(tipos[col])
     return df
 
 def _aplicar_schema(df: pd.DataFrame) -> pd.DataFrame:
+    import pandas as pd
+
     df = _normalizar_categoricos(df)
     for col in SCHEMA_NUMERICAS:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
+            # Valores do formulário já são numéricos; só texto passa pelo parser
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            df[col] = df[col].astype(np.float32)
     return df
 
 # -------------------------------
 # Mapeamento da saída do modelo
 # -------------------------------
+LIMITES_PREDICAO = np.array([1.5, 2.5, 3.5, 4.5, 5.5, 6.5])
+ROTULOS_PREDICAO = np.array([
+    "Peso Insuficiente",
+    "Peso Normal",
+    "Sobrepeso Nível I",
+    "Sobrepeso Nível II",
+    "Obesidade Tipo I",
+    "Obesidade Tipo II",
+    "Obesidade Tipo III",
+])
+_ROTULO_OBESIDADE = np.char.startswith(ROTULOS_PREDICAO, "Obesidade")
+_IDX_SOBREPESO_II = 3
+
+def _indices_predicao(scores) -> np.ndarray:
+    return np.searchsorted(LIMITES_PREDICAO, np.asarray(scores, dtype=float), side="right")
+
 def mapear_predicao(score: float) -> str:
-    if score < 1.5:
-        return "Peso Insuficiente"
-    elif score < 2.5:
-        return "Peso Normal"
-    elif score < 3.5:
-        return "Sobrepeso Nível I"
-    elif score < 4.5:
-        return "Sobrepeso Nível II"
-    elif score < 5.5:
-        return "Obesidade Tipo I"
-    elif score < 6.5:
-        return "Obesidade Tipo II"
+    return str(ROTULOS_PREDICAO[_indices_predicao(score)])
+
+# -------------------------------
+# Caminho rápido para uma única linha (pré-processamento sem pandas)
+# -------------------------------
+def _valor_modelo(col: str, val):
+    if col in SCHEMA_CATEGORIAS:
+        if val not in _CATEGORIAS_DIRETAS[col]:
+            val = MAPA_CATEGORIAS[col].get(_norm(val)) or _pt_to_en_value(col, val)
+        return val
+    if col in SCHEMA_NUMERICAS:
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            return np.nan
+    return val
+
+def _dtype_modelo(col: str):
+    if col in SCHEMA_CATEGORIAS:
+        return _tipos_categoricos()[col]
+    return np.float32 if col in SCHEMA_NUMERICAS else None
+
+def _prever_linha(dados: dict, model, feature_names) -> dict:
+    if "IMC" in dados:
+        imc = float(dados["IMC"])
+    else:
+        peso, altura = float(dados["Peso"]), float(dados["Altura"])
+        imc = peso / altura ** 2 if peso != 0 and altura != 0 else 0.0
+
+    if "Estilo de vida saudável" in dados:
+        estilo = dados["Estilo de vida saudável"]
     else:
-        return "Obesidade Tipo III"
+        habitos_ok = all(
+            float(dados.get(col, 0)) >= minimo for col, minimo in LIMIARES_ESTILO.items()
+        )
+        calorico = _norm(dados.get("Consumo de Alimento Altamente Calórico", ""))
+        pouco_calorico = calorico not in _VALORES_SIM
+        estilo = "Saudável" if (habitos_ok and pouco_calorico) else "Não Saudável"
+
+    linha = {RENAME_MAP.get(k, k): v for k, v in dados.items()}
+    linha["IMC"] = imc
+    if feature_names is None:
+        feature_names = list(linha)
+
+    # Mesma entrada do caminho em lote: a codificação das categóricas fica com o modelo
+    import pandas as pd
+
+    entrada = pd.DataFrame({
+        col: pd.Series([_valor_modelo(col, linha[col])], dtype=_dtype_modelo(col))
+        for col in feature_names
+    })
+    pred = float(model.predict(entrada)[0])
+
+    imc_atual = float(np.round(imc, 2))
+    idx = int(_indices_predicao(pred))
+
+    # CLÍNICA + ML
+    if imc_atual < 25 and _ROTULO_OBESIDADE[idx]:
+        idx = _IDX_SOBREPESO_II
+
+    return {
+        "pred_label_raw": pred,
+        "pred_label_pt": str(ROTULOS_PREDICAO[idx]),
+        "IMC": imc_atual,
+        "Estilo de vida saudável": estilo,
+    }
 
 # -------------------------------
 # Função principal
 # -------------------------------
-def prever_obesidade(df_usuario: Union[pd.DataFrame, dict, List[dict]]):
-    model = carregar_modelo()
-
+def prever_obesidade(
+    df_usuario: Union[pd.DataFrame, dict, List[dict]],
+    model=None,
+    feature_names=None,
+):
+    if model is None:
+        model, feature_names = carregar_pacote_modelo()
+    if feature_names is None:
+        feature_names = getattr(model, "feature_names_in_", None)
+
+    # Uma única linha (caso do formulário): pré-processamento sem pandas
     if isinstance(df_usuario, dict):
-        df_usuario = pd.DataFrame([df_usuario])
-    elif isinstance(df_usuario, list):
+        return _prever_linha(df_usuario, model, feature_names)
+    if len(df_usuario) == 1:
+        if isinstance(df_usuario, list):
+            return _prever_linha(df_usuario[0], model, feature_names)
+        return _prever_linha(df_usuario.iloc[0].to_dict(), model, feature_names)
+
+    # Cópia única: os cálculos auxiliares alteram o DataFrame recebido
+    if isinstance(df_usuario, list):
+        import pandas as pd
+
         df_usuario = pd.DataFrame(df_usuario)
+    else:
+        df_usuario = df_usuario.copy()
 
     df_usuario = calcular_imc(df_usuario)
     df_usuario = calcular_estilo(df_usuario)
@@ -195,27 +373,30 @@ def prever_obesidade(df_usuario: Union[pd.DataFrame, dict, List[dict]]):
     df_proc = df_usuario.rename(columns=RENAME_MAP)
     df_proc = _aplicar_schema(df_proc)
 
-    feature_names = getattr(model, "feature_names_in_", None)
+    # As categóricas seguem como pd.Categorical: o XGBoost faz a própria
+    # codificação a partir das categorias guardadas no modelo
     if feature_names is not None:
-        df_proc = df_proc[feature_names]
+        df_proc = df_proc[list(feature_names)]
 
     preds = model.predict(df_proc)
 
-    resultados = []
-    for i, p in enumerate(preds):
-        imc_atual = round(df_usuario["IMC"].iloc[i], 2)
+    imc_arr = df_usuario["IMC"].round(2).to_numpy()
+    idx = _indices_predicao(preds)
 
-        label_modelo = mapear_predicao(float(p))
+    # CLÍNICA + ML
+    idx[(imc_arr < 25) & _ROTULO_OBESIDADE[idx]] = _IDX_SOBREPESO_II
+    labels = ROTULOS_PREDICAO[idx]
 
-        # CLÍNICA + ML
-        if imc_atual < 25 and "Obesidade" in label_modelo:
-            label_modelo = "Sobrepeso Nível II"
+    estilo_arr = df_usuario["Estilo de vida saudável"].to_numpy()
 
-        resultados.append({
+    resultados = [
+        {
             "pred_label_raw": float(p),
-            "pred_label_pt": label_modelo,
-            "IMC": imc_atual,
-            "Estilo de vida saudável": df_usuario["Estilo de vida saudável"].iloc[i],
-        })
-
-    return resultados[0] if len(resultados) == 1 else resultados
\ No newline at end of file
+            "pred_label_pt": str(label),
+            "IMC": float(imc),
+            "Estilo de vida saudável": estilo,
+        }
+        for p, label, imc, estilo in zip(preds, labels, imc_arr, estilo_arr)
+    ]
+
+    return resultados[0] if len(resultados) == 1 else resultados